@@ -0,0 +1,133 @@
+"""Vuruş başına sinyal ile toplu değişiklik sinyalini karşılaştırır.
+
+Dinleyici ile arayüz arasındaki her sinyal, Qt olay kuyruğuna bir
+olay ekler. Bu betik sabit hızda gelen sentetik vuruşları iki yolla
+işler:
+
+- tek: eski yol; her vuruşta bir olay, arayüz tüm listeyi sıralayıp
+  metni baştan oluşturur.
+- toplu: uygulamadaki yol; dinleyici her pencerede ``apply_deltas`` ve
+  ``save_if_due`` çağırır, arayüz ``StatRows.apply`` ile yalnızca
+  değişen satırları biçimlendirir.
+
+Arayüz süresine Qt'nin metin belgesine yazma maliyeti dahil değildir.
+Dinleyici tarafındaki süre (değişiklik uygulama + diske yazma) ayrı
+sütunda, kayıt başına ortalama ile birlikte verilir. Toplu yolun deposu
+7 günlük geçmişle doldurulur.
+
+Kullanım: python benchmarks/bench_batched_signals.py
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from key_stats import (KeyCountStore, KeyDeltaBatcher, StatRows, BATCH_INTERVAL_MS,
+                       format_stat_line, is_valid_key, top_keys)
+
+KEYS = ([chr(c) for c in range(ord('a'), ord('z') + 1)] + [str(d) for d in range(10)] +
+        ['Key.space', 'Key.enter', 'Key.backspace', 'Key.shift'])
+
+SECONDS = 30
+RATES = (10, 50, 200, 1000)
+
+
+def render(store):
+    stats_text = ""
+    for key, count in top_keys(store):
+        stats_text += format_stat_line(key, count) + "\n"
+    return stats_text
+
+
+def per_keystroke(strokes):
+    store = KeyCountStore()
+    events = 0
+    gui_time = 0.0
+    for when, key in strokes:
+        store.increment(key, timestamp=when)
+        events += 1
+        started = time.process_time()
+        render(store)
+        gui_time += time.process_time() - started
+    return events, gui_time
+
+
+def update_view(store, rows, deltas):
+    """KeyboardRecorder.update_stat_lines ile aynı iş, Qt olmadan."""
+    changed = [key for key, _ in deltas if is_valid_key(key)]
+    _, counts = store.snapshot()
+    dirty_rows = rows.apply(changed, counts)
+    if dirty_rows is None:
+        rows.reset(top_keys(store))
+        return [format_stat_line(key, count) for key, count in rows.rows]
+    return [format_stat_line(*rows.rows[row]) for row in dirty_rows]
+
+
+def prefilled_store(directory, base):
+    """Sıcak bölümü dolu (7 günlük kova) bir depo; kayıt maliyeti gerçekçi olsun."""
+    store = KeyCountStore(os.path.join(directory, "data.json"))
+    rng = random.Random(1)
+    for hour in range(1, 7 * 24):
+        for key in rng.sample(KEYS, 30):
+            store.increment(key, rng.randint(1, 200), base - hour * 3600)
+    store.save(now=base)
+    return store
+
+
+def batched(strokes, directory, base):
+    store = prefilled_store(directory, base)
+    rows = StatRows(top_keys(store))
+    batcher = KeyDeltaBatcher()
+    window = BATCH_INTERVAL_MS / 1000
+    events = saves = 0
+    gui_time = flush_time = save_time = 0.0
+
+    def flush(now):
+        nonlocal events, saves, gui_time, flush_time, save_time
+        deltas = batcher.drain()
+        if not deltas:
+            return
+        started = time.process_time()
+        store.apply_deltas(deltas, timestamp=now)
+        save_started = time.perf_counter()
+        if store.save_if_due(now):
+            saves += 1
+            save_time += time.perf_counter() - save_started
+        flush_time += time.process_time() - started
+        events += 1
+        started = time.process_time()
+        update_view(store, rows, deltas)
+        gui_time += time.process_time() - started
+
+    next_flush = window
+    for offset, key in strokes:
+        while offset >= next_flush:
+            flush(base + next_flush)
+            next_flush += window
+        batcher.add(key)
+    flush(base + next_flush)
+    return events, gui_time, flush_time, saves, save_time
+
+
+def main():
+    rng = random.Random(0)
+    base = time.time()
+    print(f"{BATCH_INTERVAL_MS} ms pencere, {SECONDS} s sürekli yazım")
+    print(f"{'hız (tuş/s)':<12}{'olay (tek)':>11}{'olay (toplu)':>13}"
+          f"{'GUI ms (tek)':>13}{'GUI ms (toplu)':>15}"
+          f"{'dinleyici ms':>14}{'kayıt':>7}{'ms/kayıt':>10}")
+    for rate in RATES:
+        strokes = [(i / rate, rng.choice(KEYS)) for i in range(rate * SECONDS)]
+        single_events, single_time = per_keystroke([(base + when, key) for when, key in strokes])
+        with tempfile.TemporaryDirectory() as directory:
+            batch_events, batch_time, flush_time, saves, save_time = batched(strokes, directory, base)
+        print(f"{rate:<12}{single_events:>11}{batch_events:>13}"
+              f"{single_time * 1000:>13.1f}{batch_time * 1000:>15.1f}"
+              f"{flush_time * 1000:>14.1f}{saves:>7}{save_time / max(saves, 1) * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Geçmiş büyüdükçe açılışta depo yükleme süresini ölçer.
+
+Tepsi simgesi, ``KeyCountStore`` oluşturulduktan hemen sonra gösterildiği
+için bu süre simgenin görünme süresindeki veriye bağlı kısmı verir.
+Karşılaştırma için tüm geçmişi tek dosyadan okuyan eski yöntem de ölçülür.
+
+Kullanım: python benchmarks/bench_cold_start.py
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from key_stats import KeyCountStore, range_total
+
+KEYS = ([chr(c) for c in range(ord('a'), ord('z') + 1)] + [str(d) for d in range(10)] +
+        ['Key.space', 'Key.enter', 'Key.backspace', 'Key.shift', 'Key.ctrl_l'])
+
+SPANS = (("1 gün", 1), ("1 ay", 30), ("1 yıl", 365), ("3 yıl", 3 * 365))
+
+
+def build(directory, days, now):
+    store = KeyCountStore()
+    store.path = os.path.join(directory, "data.json")
+    rng = random.Random(days)
+    for hour in range(days * 24):
+        timestamp = now - hour * 3600
+        for key in rng.sample(KEYS, 20):
+            store.increment(key, rng.randint(1, 200), timestamp)
+    # Eski tek dosya yöntemiyle karşılaştırma için tüm geçmiş
+    with open(os.path.join(directory, "full.json"), 'w', encoding='utf-8') as f:
+        json.dump({str(start): bucket for start, bucket in store.history.items()}, f)
+    store.save(now=now)
+    return store.path
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def best_of(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    now = time.time()
+    print(f"{'geçmiş':<10}{'sıcak açılış (ms)':>20}{'tam yükleme (ms)':>20}{'1 yıl önceki ay (ms)':>24}")
+    for label, days in SPANS:
+        with tempfile.TemporaryDirectory() as directory:
+            path = build(directory, days, now)
+            full_path = os.path.join(directory, "full.json")
+            hot_ms = best_of(lambda: KeyCountStore(path))
+            full_ms = best_of(lambda: load_json(full_path))
+            start = now - 365 * 86400
+            cold_ms = best_of(lambda: range_total.uncached(KeyCountStore(path), start, start + 30 * 86400))
+            print(f"{label:<10}{hot_ms:>20.2f}{full_ms:>20.2f}{cold_ms:>24.2f}")
+
+
+if __name__ == '__main__':
+    main()
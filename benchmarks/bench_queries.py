@@ -0,0 +1,51 @@
+"""Önbellekli ve önbelleksiz sorgu gecikmesini karşılaştırır.
+
+Kullanım: python benchmarks/bench_queries.py
+"""
+import os
+import sys
+import time
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from key_stats import KeyCountStore, total, top_keys, group_shares, range_total
+
+KEYS = ([chr(c) for c in range(ord('a'), ord('z') + 1)] + [str(d) for d in range(10)] +
+        ['Key.space', 'Key.enter', 'Key.backspace', 'Key.shift', 'Key.ctrl_l',
+         'Key.alt', 'Key.up', 'Key.down', 'Key.left', 'Key.right', 'Key.tab'])
+
+
+def build_store(days):
+    store = KeyCountStore()
+    now = time.time()
+    rng = random.Random(0)
+    for hour in range(days * 24):
+        timestamp = now - hour * 3600
+        for key in rng.sample(KEYS, 20):
+            store.increment(key, rng.randint(1, 200), timestamp)
+    return store
+
+
+def main():
+    store = build_store(days=365)
+    start, end = time.time() - 30 * 86400, time.time()
+    queries = [
+        ("total", lambda: total(store), lambda: total.uncached(store)),
+        ("top_keys(10)", lambda: top_keys(store, 10), lambda: top_keys.uncached(store, 10)),
+        ("group_shares", lambda: group_shares(store), lambda: group_shares.uncached(store)),
+        ("range_total(30g)", lambda: range_total(store, start, end),
+         lambda: range_total.uncached(store, start, end)),
+    ]
+    number = 200
+    print(f"{'sorgu':<18}{'önbelleksiz (µs)':>18}{'önbellekli (µs)':>18}")
+    for name, cached, uncached in queries:
+        cached()
+        uncached_us = timeit.timeit(uncached, number=number) / number * 1e6
+        cached_us = timeit.timeit(cached, number=number) / number * 1e6
+        print(f"{name:<18}{uncached_us:>18.1f}{cached_us:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,437 @@
+"""Klavye Kaydedici sayaç deposu ve sorgu fonksiyonları.
+
+Bu modül Qt'ye bağımlı değildir; betiklerden veya panolardan doğrudan
+içe aktarılabilir:
+
+    from key_stats import KeyCountStore, total, top_keys
+    store = KeyCountStore(path)
+    print(total(store), top_keys(store, 10))
+
+Sorgu sonuçları, deponun sürüm sayacına göre anahtarlanan bir LRU
+önbelleğinde tutulur; depo değişmediği sürece tekrarlanan sorgular
+yeniden hesaplama yapmaz.
+
+Disk düzeni:
+
+    data.json            sıcak bölüm: ömür boyu toplamlar + son günlerin kovaları
+    history/index.json   soğuk bölüm dizini: {"YYYY-MM": [ilk kova, son kova]}
+    history/YYYY-MM.json bir aylık saatlik kovalar
+
+Açılışta yalnızca sıcak bölüm okunur; soğuk bölümler bir sorgu o zaman
+aralığını istediğinde yüklenir ve bellek bütçesi aşılınca atılır.
+"""
+import os
+import json
+import time
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# Geçmiş kovalarının genişliği (saniye). Her kova bir saatlik sayımları tutar.
+BUCKET_SECONDS = 3600
+
+# Sıcak bölümde tutulan geçmiş süresi; daha eski kovalar soğuk bölümlere taşınır.
+HOT_SECONDS = 7 * 24 * 3600
+
+# Bellekte aynı anda tutulabilecek soğuk kova sayısı (varsayılan ~3 ay).
+DEFAULT_COLD_BUDGET = 3 * 31 * 24
+
+DATA_FORMAT = 2
+
+# Dinleyicinin sıcak bölümü diske yazma aralığı (saniye).
+SAVE_INTERVAL = 5
+
+# Depo başına önbellekte tutulan en fazla sorgu sonucu.
+QUERY_CACHE_SIZE = 256
+
+# Dinleyiciden arayüze gönderilen tuş değişikliklerinin toplanma penceresi.
+BATCH_INTERVAL_MS = 50
+
+# Tuş grupları
+MODIFIER_KEYS = frozenset({
+    'Key.shift', 'Key.shift_l', 'Key.shift_r',
+    'Key.ctrl', 'Key.ctrl_l', 'Key.ctrl_r',
+    'Key.alt', 'Key.alt_l', 'Key.alt_r', 'Key.alt_gr',
+    'Key.cmd', 'Key.cmd_l', 'Key.cmd_r',
+    'Key.caps_lock',
+})
+NAVIGATION_KEYS = frozenset({
+    'Key.up', 'Key.down', 'Key.left', 'Key.right',
+    'Key.home', 'Key.end', 'Key.page_up', 'Key.page_down',
+})
+KEY_GROUPS = ('letters', 'digits', 'modifiers', 'navigation', 'other')
+
+
+def _write_atomic(path, text):
+    """Dosyayı önce geçici dosyaya yazar, sonra yerine taşır.
+
+    Yazma yarıda kesilirse eski dosya bozulmadan kalır.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def key_group(key):
+    """Bir tuş adının ait olduğu grubu döndürür."""
+    if key in MODIFIER_KEYS:
+        return 'modifiers'
+    if key in NAVIGATION_KEYS:
+        return 'navigation'
+    if len(key) == 1:
+        if key.isalpha():
+            return 'letters'
+        if key.isdigit():
+            return 'digits'
+    return 'other'
+
+
+class KeyCountStore:
+    """Tuş sayımlarını ve saatlik geçmişi tutan, iş parçacığı güvenli depo.
+
+    Her değişiklik ``version`` sayacını artırır; sorgu önbelleği bu
+    sayaca göre geçersiz kılınır. ``history`` yalnızca sıcak kovaları
+    içerir; eski kovalar ``buckets()`` ile soğuk bölümlerden okunur.
+    """
+
+    def __init__(self, path=None, cold_budget=DEFAULT_COLD_BUDGET):
+        self.path = path
+        self.counts = {}
+        # Kova başlangıç zamanı (epoch saniye) -> {tuş: sayı}
+        self.history = {}
+        self.version = 0
+        self.cold_budget = cold_budget
+        # Bölüm adı -> [ilk kova, son kova]
+        self._cold_index = {}
+        # Bellekteki soğuk bölümler, en son kullanılan sonda
+        self._cold = OrderedDict()
+        self._lock = threading.Lock()
+        self._cold_lock = threading.RLock()
+        # Sorgu önbelleği: (sorgu adı, argümanlar) -> sonuç; sürüm değişince boşaltılır
+        self._query_cache = OrderedDict()
+        self._query_cache_version = None
+        self._query_cache_lock = threading.Lock()
+        self._last_save = None
+        if path:
+            self.load()
+
+    @property
+    def cold_dir(self):
+        return os.path.join(os.path.dirname(self.path), "history")
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.cold_dir, "index.json")
+
+    def _segment_path(self, name):
+        return os.path.join(self.cold_dir, f"{name}.json")
+
+    def load(self):
+        counts, history = {}, {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                data = {}
+            if data.get("format") == DATA_FORMAT:
+                counts = data.get("totals", {})
+                history = {int(start): bucket for start, bucket in data.get("recent", {}).items()}
+            else:
+                # Eski düz biçim: {tuş: sayı}
+                counts = data
+        cold_index = {}
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    cold_index = json.load(f)
+            except (json.JSONDecodeError, FileNotFoundError):
+                cold_index = {}
+        with self._lock:
+            self.counts = counts
+            self.history = history
+            self.version += 1
+        with self._cold_lock:
+            self._cold_index = cold_index
+            self._cold.clear()
+
+    def save(self, now=None):
+        if now is None:
+            now = time.time()
+        cutoff = now - HOT_SECONDS
+        # Kovalar sıcaktan soğuğa taşınırken buckets() ara durumu görmemeli
+        with self._cold_lock:
+            with self._lock:
+                expired = {start: self.history.pop(start)
+                           for start in [start for start in self.history if start < cutoff]}
+                counts = dict(self.counts)
+                recent = {str(start): dict(bucket) for start, bucket in self.history.items()}
+            if expired:
+                self._archive(expired)
+        # Toplamlar okunabilir kalsın; kovalar yer kaplamasın diye sıkışık yazılır
+        _write_atomic(self.path, '{"format": %d,\n"totals": %s,\n"recent": %s}\n' % (
+            DATA_FORMAT,
+            json.dumps(counts, indent=4, ensure_ascii=False),
+            json.dumps(recent, separators=(',', ':'), ensure_ascii=False)))
+        self._last_save = now
+
+    def save_if_due(self, now=None):
+        """Gerekliyse kaydeder; kaydettiyse True döndürür.
+
+        Son kayıttan bu yana ``SAVE_INTERVAL`` geçtiyse ya da soğuk bölüme
+        taşınması gereken kova varsa kayıt yapılır.
+        """
+        if now is None:
+            now = time.time()
+        # Saat geri alındıysa da kaydet
+        due = (self._last_save is None or now < self._last_save
+               or now - self._last_save >= SAVE_INTERVAL)
+        if not due:
+            cutoff = now - HOT_SECONDS
+            with self._lock:
+                due = any(start < cutoff for start in self.history)
+        if due:
+            self.save(now)
+        return due
+
+    def _archive(self, expired):
+        """Sıcak bölümden düşen kovaları aylık soğuk bölümlerle birleştirir."""
+        by_segment = {}
+        for start, bucket in expired.items():
+            name = time.strftime('%Y-%m', time.gmtime(start))
+            by_segment.setdefault(name, {})[start] = bucket
+        with self._cold_lock:
+            os.makedirs(self.cold_dir, exist_ok=True)
+            for name, buckets in by_segment.items():
+                segment = dict(self._read_segment(name)) if name in self._cold_index else {}
+                segment.update(buckets)
+                _write_atomic(self._segment_path(name), json.dumps(
+                    {str(start): bucket for start, bucket in segment.items()}, ensure_ascii=False))
+                self._cold_index[name] = [min(segment), max(segment)]
+                self._cold.pop(name, None)
+            _write_atomic(self._index_path, json.dumps(self._cold_index, indent=4, sort_keys=True))
+
+    def _read_segment(self, name):
+        """Bir soğuk bölümü önbellekten veya diskten döndürür."""
+        with self._cold_lock:
+            if name in self._cold:
+                self._cold.move_to_end(name)
+                return self._cold[name]
+            try:
+                with open(self._segment_path(name), 'r', encoding='utf-8') as f:
+                    segment = {int(start): bucket for start, bucket in json.load(f).items()}
+            except (json.JSONDecodeError, FileNotFoundError, ValueError):
+                segment = {}
+            self._cold[name] = segment
+            self._evict()
+            return segment
+
+    def _evict(self):
+        held = sum(len(segment) for segment in self._cold.values())
+        # En az bir bölüm (az önce istenen) her zaman bellekte kalır
+        while held > self.cold_budget and len(self._cold) > 1:
+            _, segment = self._cold.popitem(last=False)
+            held -= len(segment)
+
+    def buckets(self, start, end):
+        """[start, end) aralığındaki (kova başlangıcı, kova) çiftlerini döndürür.
+
+        Yalnızca aralıkla kesişen soğuk bölümler diskten okunur.
+        """
+        result = []
+        with self._cold_lock:
+            names = [name for name, (first, last) in sorted(self._cold_index.items())
+                     if first < end and last >= start]
+            for name in names:
+                segment = self._read_segment(name)
+                result.extend((bucket_start, dict(bucket)) for bucket_start, bucket in segment.items()
+                              if start <= bucket_start < end)
+            with self._lock:
+                result.extend((bucket_start, dict(bucket)) for bucket_start, bucket in self.history.items()
+                              if start <= bucket_start < end)
+        result.sort(key=lambda item: item[0])
+        return result
+
+    def increment(self, key, amount=1, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        start = int(timestamp) - int(timestamp) % BUCKET_SECONDS
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + amount
+            bucket = self.history.setdefault(start, {})
+            bucket[key] = bucket.get(key, 0) + amount
+            self.version += 1
+
+    def apply_deltas(self, deltas, timestamp=None):
+        """(tuş, artış) çiftlerini tek seferde uygular; sürüm bir kez artar."""
+        if not deltas:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        start = int(timestamp) - int(timestamp) % BUCKET_SECONDS
+        with self._lock:
+            bucket = self.history.setdefault(start, {})
+            for key, amount in deltas:
+                self.counts[key] = self.counts.get(key, 0) + amount
+                bucket[key] = bucket.get(key, 0) + amount
+            self.version += 1
+
+    def snapshot(self):
+        """Tutarlı okuma için (sürüm, sayımlar) kopyası döndürür."""
+        with self._lock:
+            return self.version, dict(self.counts)
+
+
+class KeyDeltaBatcher:
+    """Tuş vuruşlarını biriktirip toplu (tuş, artış) çiftleri olarak verir.
+
+    ``add`` dinleyici iş parçacığından her vuruşta çağrılır; ``drain``
+    birikenleri alır ve sayacı sıfırlar.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(self, key, amount=1):
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + amount
+
+    def drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return tuple(pending.items())
+
+
+def format_stat_line(key, count):
+    """İstatistik listesindeki bir satırın metni."""
+    if key and key.startswith('Key.'):
+        key = key.replace('Key.', '')
+    return f"{key}: {count}"
+
+
+class StatRows:
+    """İstatistik görünümündeki sıralı satırların Qt'den bağımsız modeli.
+
+    ``reset`` satırları baştan kurar; ``apply`` yalnızca değişen tuşları
+    günceller ve yeniden yazılması gereken satır numaralarını döndürür.
+    """
+
+    def __init__(self, items=()):
+        self.reset(items)
+
+    def reset(self, items):
+        # Sıralı [tuş, sayı] listesi ve tuş -> satır numarası
+        self.rows = [[key, count] for key, count in items]
+        self.row_of = {key: row for row, (key, _) in enumerate(self.rows)}
+
+    def apply(self, keys, counts):
+        """Değişen tuşların sayılarını ``counts`` içinden alır.
+
+        Değişen satır numaralarını sıralı döndürür. Listede olmayan bir
+        tuş varsa hiçbir şeyi değiştirmeden None döndürür; çağıran bu
+        durumda satırları ``reset`` ile baştan kurmalıdır.
+        """
+        if any(key not in self.row_of for key in keys):
+            return None
+        dirty_rows = set()
+        for key in keys:
+            row = self.row_of[key]
+            self.rows[row][1] = counts.get(key, 0)
+            # Sayısı artan satırı sıralama bozulmayacak yere kadar yukarı taşı
+            while row > 0 and self.rows[row - 1][1] < self.rows[row][1]:
+                self.rows[row - 1], self.rows[row] = self.rows[row], self.rows[row - 1]
+                self.row_of[self.rows[row][0]] = row
+                dirty_rows.add(row)
+                row -= 1
+            self.row_of[key] = row
+            dirty_rows.add(row)
+        return sorted(dirty_rows)
+
+
+def _memoized(func):
+    """Sorgu sonucunu deponun kendi LRU önbelleğinde tutar.
+
+    Önbellek deponun sürümü değişince boşaltılır. Depoya ait olduğu için
+    depo bırakıldığında sonuçlar da onunla birlikte bırakılır. Argümanlar
+    imzaya göre normalleştirilir; ``top_keys(store)`` ile
+    ``top_keys(store, k=None)`` aynı kaydı paylaşır.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(store, *args, **kwargs):
+        bound = signature.bind(store, *args, **kwargs)
+        bound.apply_defaults()
+        args = bound.args[1:]
+        version = store.version
+        cache_key = (func.__name__, args)
+        with store._query_cache_lock:
+            if store._query_cache_version != version:
+                store._query_cache.clear()
+                store._query_cache_version = version
+            elif cache_key in store._query_cache:
+                store._query_cache.move_to_end(cache_key)
+                return store._query_cache[cache_key]
+        result = func(store, *args)
+        with store._query_cache_lock:
+            if store._query_cache_version == version:
+                store._query_cache[cache_key] = result
+                if len(store._query_cache) > QUERY_CACHE_SIZE:
+                    store._query_cache.popitem(last=False)
+        return result
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def is_valid_key(key):
+    """pynput bazı tuşlar için None üretir; JSON'a kaydedilince 'null' olur.
+
+    Bu tuşlar hiçbir sorguda sayılmaz.
+    """
+    return key not in (None, 'null')
+
+
+def _valid_counts(store):
+    _, counts = store.snapshot()
+    return {key: count for key, count in counts.items() if is_valid_key(key)}
+
+
+@_memoized
+def total(store):
+    """Toplam tuş vuruşu sayısı."""
+    return sum(_valid_counts(store).values())
+
+
+@_memoized
+def top_keys(store, k=None):
+    """En çok basılan ``k`` tuşu (tuş, sayı) çiftleri olarak döndürür.
+
+    ``k`` verilmezse tüm tuşlar çok basılandan aza doğru sıralanır.
+    """
+    sorted_keys = sorted(_valid_counts(store).items(), key=lambda item: item[1], reverse=True)
+    return tuple(sorted_keys if k is None else sorted_keys[:k])
+
+
+@_memoized
+def group_shares(store):
+    """Her tuş grubunun toplam içindeki payını (grup, oran) çiftleri olarak döndürür."""
+    sums = dict.fromkeys(KEY_GROUPS, 0)
+    for key, count in _valid_counts(store).items():
+        sums[key_group(key)] += count
+    grand_total = sum(sums.values())
+    return tuple((group, sums[group] / grand_total if grand_total else 0.0) for group in KEY_GROUPS)
+
+
+@_memoized
+def range_total(store, start, end):
+    """[start, end) zaman aralığındaki (epoch saniye) tuş vuruşlarını toplar.
+
+    Geçmiş saatlik kovalarla tutulduğundan, aralıkla kesişen kovalar
+    kova başlangıcına göre dahil edilir.
+    """
+    return sum(count for _, bucket in store.buckets(start, end)
+               for key, count in bucket.items() if is_valid_key(key))
@@ -1,12 +1,13 @@
 import sys
 import os
-import json
+import time
 import subprocess
+from collections import deque
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLineEdit,
                              QTextEdit, QLabel, QSystemTrayIcon, QMenu,
                              QAction, QMainWindow, QGroupBox, QFileDialog, QMessageBox, QPushButton)
-from PyQt5.QtGui import QIcon, QPixmap, QPainter, QFont
-from PyQt5.QtCore import Qt, QObject, pyqtSignal, QThread
+from PyQt5.QtGui import QIcon, QPixmap, QPainter, QFont, QTextCursor
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QThread, QTimer
 from pynput import keyboard
 
 # Matplotlib için gerekli importlar
@@ -14,33 +15,30 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 
+from key_stats import (KeyCountStore, KeyDeltaBatcher, StatRows, BATCH_INTERVAL_MS,
+                       format_stat_line, is_valid_key, top_keys)
+
 # Veri dosyası için yolu tanımla
 data_file_path = os.path.join(os.path.expanduser("~"), ".klavye_kaydedici", "data.json")
 
 # Dizin yoksa oluştur
 os.makedirs(os.path.dirname(data_file_path), exist_ok=True)
 
-# Mevcut verileri yükle veya yeni bir sözlük oluştur
-key_counts = {}
-if os.path.exists(data_file_path):
-    try:
-        with open(data_file_path, 'r', encoding='utf-8') as f:
-            key_counts = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        key_counts = {}
-
 # Ana pencere için global bir referans
 app = None
 
 # Klavye dinleyici iş parçacığından sinyal yaymak için yardımcı bir sınıf
+# Her yayın, kısa bir pencerede biriken (tuş, artış) çiftlerini taşır
 class KeyboardSignalEmitter(QObject):
-    key_pressed = pyqtSignal()
+    keys_counted = pyqtSignal(object)
 
 # Klavye dinleyici iş parçacığı
 class QKeyboardListenerThread(QThread):
-    def __init__(self, emitter):
+    def __init__(self, emitter, store):
         super().__init__()
         self.emitter = emitter
+        self.store = store
+        self.batcher = KeyDeltaBatcher()
         self.listener = None
 
     def run(self):
@@ -48,22 +46,30 @@ class QKeyboardListenerThread(QThread):
         self.listener = keyboard.Listener(on_press=self.on_press)
         self.listener.start()
         
-        # Dinleyici iş parçacığının bitmesini bekle
-        self.listener.join()
+        # Dinleyici çalıştığı sürece biriken vuruşları toplu olarak gönder
+        while self.listener.is_alive():
+            self.msleep(BATCH_INTERVAL_MS)
+            self.flush()
+        # Durdurulurken kalan vuruşları gönder ve son durumu diske yaz
+        self.flush()
+        self.store.save()
     
     def on_press(self, key):
-        global key_counts
         try:
             key_str = key.char
         except AttributeError:
             key_str = str(key)
         
-        key_counts[key_str] = key_counts.get(key_str, 0) + 1
-        
-        with open(data_file_path, 'w', encoding='utf-8') as f:
-            json.dump(key_counts, f, indent=4, ensure_ascii=False)
+        self.batcher.add(key_str)
 
-        self.emitter.key_pressed.emit()
+    def flush(self):
+        deltas = self.batcher.drain()
+        if not deltas:
+            return
+        self.store.apply_deltas(deltas)
+        # Her pencerede değil, birkaç saniyede bir (ve arşivleme gerektiğinde) yaz
+        self.store.save_if_due()
+        self.emitter.keys_counted.emit(deltas)
     
     def stop(self):
         # pynput listener'ını durdurmak için
@@ -94,9 +100,10 @@ def get_keyboard_model():
 
 # Yeni istatistik penceresi sınıfı (çubuk grafik)
 class StatsWindow(QMainWindow):
-    def __init__(self, key_counts):
+    def __init__(self, store):
         super().__init__()
-        self.key_counts = key_counts
+        self.store = store
+        self.bars = {}
         self.initUI()
 
     def initUI(self):
@@ -114,7 +121,7 @@ class StatsWindow(QMainWindow):
         self.setCentralWidget(central_widget)
         vbox = QVBoxLayout(central_widget)
 
-        if not self.key_counts:
+        if not top_keys(self.store):
             no_data_label = QLabel("Grafik oluşturmak için yeterli veri yok.")
             no_data_label.setAlignment(Qt.AlignCenter)
             no_data_label.setStyleSheet("font-size: 14pt; color: #e0e0e0;")
@@ -131,11 +138,10 @@ class StatsWindow(QMainWindow):
     def plot_graphs(self):
         self.figure.clear()
         
-        valid_keys = {key: count for key, count in self.key_counts.items() if key is not None}
-        if not valid_keys:
+        sorted_keys = top_keys(self.store)
+        if not sorted_keys:
             return
             
-        sorted_keys = sorted(valid_keys.items(), key=lambda item: item[1], reverse=True)
         keys, counts = zip(*sorted_keys)
 
         # Özel tuş adlarını kısaltma
@@ -156,7 +162,11 @@ class StatsWindow(QMainWindow):
         ax = self.figure.add_subplot(111, facecolor="#212121")
         
         # Grafik çizimi
-        ax.barh(display_keys, counts, color='#007acc')
+        bar_container = ax.barh(display_keys, counts, color='#007acc')
+        self.ax = ax
+        self.bars = dict(zip(keys, bar_container.patches))
+        self.bar_keys = keys
+        self.bar_index = {key: index for index, key in enumerate(keys)}
         
         ax.set_title("Tuş Vuruş İstatistikleri", color="#e0e0e0")
         ax.set_xlabel("Vuruş Sayısı", color="#e0e0e0")
@@ -180,10 +190,33 @@ class StatsWindow(QMainWindow):
         
         self.canvas.draw()
 
+    def apply_deltas(self, deltas):
+        if not hasattr(self, 'canvas'):
+            return
+        changed = [key for key, _ in deltas if is_valid_key(key)]
+        # Grafik henüz yoksa veya yeni bir tuş geldiyse baştan çiz
+        if not self.bars or any(key not in self.bars for key in changed):
+            self.plot_graphs()
+            return
+
+        _, counts = self.store.snapshot()
+        for key in changed:
+            self.bars[key].set_width(counts.get(key, 0))
+        # Sayılar yalnızca artar; bir çubuk üstündekini geçtiyse sıra bozulmuştur
+        for key in changed:
+            index = self.bar_index[key]
+            if index > 0 and self.bars[self.bar_keys[index - 1]].get_width() < self.bars[key].get_width():
+                self.plot_graphs()
+                return
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+
 
 class KeyboardRecorder(QMainWindow):
-    def __init__(self):
+    def __init__(self, store):
         super().__init__()
+        self.store = store
         self.initUI()
         self.stats_window = None
         
@@ -322,21 +355,39 @@ class KeyboardRecorder(QMainWindow):
                 QMessageBox.warning(self, "Hata", f"Dosya kaydedilirken bir hata oluştu: {e}")
     
     def show_stats_window(self):
-        self.stats_window = StatsWindow(key_counts)
+        self.stats_window = StatsWindow(self.store)
         self.stats_window.show()
 
+    def apply_deltas(self, deltas):
+        self.update_stat_lines(deltas)
+        if self.stats_window is not None and self.stats_window.isVisible():
+            self.stats_window.apply_deltas(deltas)
+
     def update_stats(self):
-        valid_keys = {key: count for key, count in key_counts.items() if key is not None}
-        sorted_keys = sorted(valid_keys.items(), key=lambda item: item[1], reverse=True)
-        
+        # Ekrandaki satırların modeli
+        self.stat_rows = StatRows(top_keys(self.store))
+
         stats_text = ""
-        for key, count in sorted_keys:
-            if key and key.startswith('Key.'):
-                key = key.replace('Key.', '')
-            stats_text += f"{key}: {count}\n"
+        for key, count in self.stat_rows.rows:
+            stats_text += format_stat_line(key, count) + "\n"
         
         self.stats_display.setPlainText(stats_text)
 
+    def update_stat_lines(self, deltas):
+        changed = [key for key, _ in deltas if is_valid_key(key)]
+        _, counts = self.store.snapshot()
+        dirty_rows = self.stat_rows.apply(changed, counts)
+        # Yeni bir tuş satır eklemeyi gerektirir; bu nadir durumda baştan oluştur
+        if dirty_rows is None:
+            self.update_stats()
+            return
+
+        document = self.stats_display.document()
+        for row in dirty_rows:
+            cursor = QTextCursor(document.findBlockByNumber(row))
+            cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+            cursor.insertText(format_stat_line(*self.stat_rows.rows[row]))
+
     def closeEvent(self, event):
         self.hide()
         event.ignore()
@@ -357,12 +408,19 @@ class SystemTrayApp(QApplication):
         self.setFont(font)
         
         self.setQuitOnLastWindowClosed(False)
-        self.main_window = KeyboardRecorder()
+        # Açılışta yalnızca sıcak bölüm okunur; geçmiş istendiğinde yüklenir
+        self.key_store = KeyCountStore(data_file_path)
+        self.main_window = KeyboardRecorder(self.key_store)
         
+        # Son bir dakikadaki (zaman, vuruş) kayıtları; tepsi ipucunda hız gösterilir
+        self.recent_batches = deque()
+        self.recent_total = 0
+
         self.signal_emitter = KeyboardSignalEmitter()
-        self.signal_emitter.key_pressed.connect(self.main_window.update_stats)
+        self.signal_emitter.keys_counted.connect(self.main_window.apply_deltas)
+        self.signal_emitter.keys_counted.connect(self.record_rate)
         
-        self.listener_thread = QKeyboardListenerThread(self.signal_emitter)
+        self.listener_thread = QKeyboardListenerThread(self.signal_emitter, self.key_store)
         self.listener_thread.start()
 
         icon_path = os.path.join(os.path.dirname(__file__), "icon.png")
@@ -393,9 +451,27 @@ class SystemTrayApp(QApplication):
         
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
+
+        # Yazım durduğunda da eski kayıtların düşmesi için ipucunu her saniye yenile
+        self.rate_timer = QTimer(self)
+        self.rate_timer.timeout.connect(self.refresh_rate)
+        self.rate_timer.start(1000)
+        self.refresh_rate()
         
         self.show_window()
 
+    def record_rate(self, deltas):
+        amount = sum(increment for _, increment in deltas)
+        self.recent_batches.append((time.monotonic(), amount))
+        self.recent_total += amount
+        self.refresh_rate()
+
+    def refresh_rate(self):
+        now = time.monotonic()
+        while self.recent_batches and self.recent_batches[0][0] < now - 60:
+            self.recent_total -= self.recent_batches.popleft()[1]
+        self.tray_icon.setToolTip(f"Klavye Kaydedici - Son dakika: {self.recent_total} tuş")
+
     def show_window(self):
         self.main_window.show()
         self.main_window.activateWindow()